@@ -7,13 +7,109 @@ Each tunnel has its own YAML config file.
 """
 
 import os
+import re
+import copy
 import yaml
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+
+# Prefer the libyaml-backed C loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
 
 CONFIG_DIR = Path("/etc/vortexl2")
 TUNNELS_DIR = CONFIG_DIR / "tunnels"
 
+# Parsed tunnel configs keyed by file path: (mtime_ns, size, data).
+# Lets repeated TunnelConfig() construction skip re-parsing unchanged files.
+_YAML_CACHE: "OrderedDict[str, Tuple[int, int, Dict[str, Any]]]" = OrderedDict()
+_YAML_CACHE_MAX = 16
+
+
+def _cache_insert(key: str, st: os.stat_result, data: Dict[str, Any]) -> None:
+    """Insert a parsed config into the LRU cache, evicting the oldest entries."""
+    _YAML_CACHE[key] = (st.st_mtime_ns, st.st_size, copy.deepcopy(data))
+    _YAML_CACHE.move_to_end(key)
+    while len(_YAML_CACHE) > _YAML_CACHE_MAX:
+        _YAML_CACHE.popitem(last=False)
+
+
+def _cache_put(path: Path, data: Dict[str, Any]) -> None:
+    """Cache data just written to path so the next reader skips the parse."""
+    key = str(path)
+    try:
+        st = os.stat(key)
+    except OSError:
+        _YAML_CACHE.pop(key, None)
+        return
+    _cache_insert(key, st, data)
+
+
+# Tunnel configs are a flat mapping of plain scalars and port lists, so they
+# can be emitted directly; anything else goes through the generic dumper.
+_PLAIN_KEY_RE = re.compile(r"[a-z_][a-z0-9_]*\Z")
+_PLAIN_STR_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._/-]*\Z")
+_STR_TAG = "tag:yaml.org,2002:str"
+_RESOLVER = yaml.resolver.Resolver()
+
+
+def _yaml_scalar(value: Any) -> Optional[str]:
+    """Render a scalar exactly as the safe dumper would, or None if unsupported."""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if type(value) is int:
+        return str(value)
+    if type(value) is str and _PLAIN_STR_RE.match(value):
+        # e.g. "10" or "yes" would load back as int/bool unless quoted
+        if _RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) == _STR_TAG:
+            return value
+        return f"'{value}'"
+    return None
+
+
+def _dump_config(config: Dict[str, Any]) -> str:
+    """Serialize a tunnel config; same output as yaml.dump(default_flow_style=False)."""
+    lines = []
+    seen_lists = set()  # a list shared by two keys is emitted as an anchor/alias
+    try:
+        keys = sorted(config)
+    except TypeError:
+        keys = None
+
+    for key in keys or ():
+        if type(key) is not str or not _PLAIN_KEY_RE.match(key):
+            break
+        value = config[key]
+        if type(value) is list:
+            if id(value) in seen_lists:
+                break
+            seen_lists.add(id(value))
+            items = [_yaml_scalar(item) for item in value]
+            if None in items:
+                break
+            if items:
+                lines.append(f"{key}:")
+                lines.extend(f"- {item}" for item in items)
+            else:
+                lines.append(f"{key}: []")
+        else:
+            scalar = _yaml_scalar(value)
+            if scalar is None:
+                break
+            lines.append(f"{key}: {scalar}")
+    else:
+        if keys:
+            return "\n".join(lines) + "\n"
+
+    return yaml.dump(config, Dumper=_Dumper, default_flow_style=False)
+
 
 class TunnelConfig:
     """Configuration for a single tunnel."""
@@ -32,6 +128,8 @@ class TunnelConfig:
         "peer_session_id": 20,
         "interface_index": 0,
         "forwarded_ports": [],
+        "bulk_ports": [],  # forwarded ports relayed with TCP_CORK instead of TCP_NODELAY
+        "fastopen_ports": [],  # forwarded ports whose upstream connect uses TCP Fast Open
     }
 
     def __init__(self, name: str, config_data: Dict[str, Any] = None, auto_save: bool = True):
@@ -39,6 +137,8 @@ class TunnelConfig:
         self._config: Dict[str, Any] = {}
         self._file_path = TUNNELS_DIR / f"{name}.yaml"
         self._auto_save = auto_save
+        self._dirty = False
+        self._batch_depth = 0
 
         if config_data:
             self._config = config_data
@@ -48,42 +148,97 @@ class TunnelConfig:
         # Apply defaults for missing keys
         for key, default in self.DEFAULTS.items():
             if key not in self._config:
-                self._config[key] = default
+                self._config[key] = copy.deepcopy(default)
 
         # Ensure name matches
         self._config["name"] = name
 
     def _load(self) -> None:
-        """Load configuration from file."""
-        if self._file_path.exists():
-            try:
-                with open(self._file_path, "r") as f:
-                    self._config = yaml.safe_load(f) or {}
-            except Exception:
-                self._config = {}
+        """Load configuration from file, reusing the cached parse if the file is unchanged."""
+        key = str(self._file_path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return
+
+        cached = _YAML_CACHE.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            _YAML_CACHE.move_to_end(key)
+            self._config = copy.deepcopy(cached[2])
+            return
+
+        try:
+            with open(self._file_path, "r") as f:
+                self._config = yaml.load(f, Loader=_Loader) or {}
+        except Exception:
+            self._config = {}
+            return
+
+        _cache_insert(key, st, self._config)
+
+    def _set(self, key: str, value: Any) -> None:
+        """Update a config value and persist it (deferred while inside batch())."""
+        if key in self._config and self._config[key] == value:
+            return
+        self._config[key] = value
+        self._dirty = True
+        self._save()
 
     def _save(self) -> None:
-        """Save configuration to file if auto_save is enabled."""
-        if not self._auto_save:
+        """Save configuration to file if auto_save is enabled and no batch is open."""
+        if not self._auto_save or self._batch_depth:
             return
+        self._write()
 
+    def _write(self) -> None:
+        """Atomically replace the config file with a single write of the serialized YAML."""
         TUNNELS_DIR.mkdir(parents=True, exist_ok=True)
-        with open(self._file_path, "w") as f:
-            yaml.dump(self._config, f, default_flow_style=False)
-
-        os.chmod(self._file_path, 0o600)
+        data = _dump_config(self._config).encode()
+
+        # Mode 0600 is applied at creation, so no separate chmod is needed
+        tmp_path = f"{self._file_path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, self._file_path)
+
+        _cache_put(self._file_path, self._config)
+        self._dirty = False
 
     def save(self) -> None:
         """Public method to force save configuration (ignores auto_save)."""
-        TUNNELS_DIR.mkdir(parents=True, exist_ok=True)
-        with open(self._file_path, "w") as f:
-            yaml.dump(self._config, f, default_flow_style=False)
-
-        os.chmod(self._file_path, 0o600)
+        self._write()
         self._auto_save = True  # Enable auto_save after manual save
 
+    def batch(self) -> "TunnelConfig":
+        """
+        Group several setter calls into a single write.
+
+        Usage: ``with config.batch(): config.local_ip = ...; config.remote_ip = ...``
+        """
+        return self
+
+    def __enter__(self) -> "TunnelConfig":
+        self._batch_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._batch_depth -= 1
+        if not self._batch_depth:
+            self._flush_if_dirty()
+
+    def _flush_if_dirty(self) -> None:
+        """Write pending changes deferred by batch()."""
+        if self._dirty:
+            self._save()
+
     def delete(self) -> bool:
         """Delete this tunnel's config file."""
+        _YAML_CACHE.pop(str(self._file_path), None)
         if self._file_path.exists():
             self._file_path.unlink()
             return True
@@ -95,8 +250,7 @@ class TunnelConfig:
 
     @name.setter
     def name(self, value: str) -> None:
-        self._config["name"] = value
-        self._save()
+        self._set("name", value)
 
     @property
     def side(self) -> Optional[str]:
@@ -104,8 +258,7 @@ class TunnelConfig:
 
     @side.setter
     def side(self, value: str) -> None:
-        self._config["side"] = value
-        self._save()
+        self._set("side", value)
 
     @property
     def local_ip(self) -> Optional[str]:
@@ -113,8 +266,7 @@ class TunnelConfig:
 
     @local_ip.setter
     def local_ip(self, value: str) -> None:
-        self._config["local_ip"] = value
-        self._save()
+        self._set("local_ip", value)
 
     @property
     def remote_ip(self) -> Optional[str]:
@@ -122,8 +274,7 @@ class TunnelConfig:
 
     @remote_ip.setter
     def remote_ip(self, value: str) -> None:
-        self._config["remote_ip"] = value
-        self._save()
+        self._set("remote_ip", value)
 
     @property
     def interface_ip(self) -> str:
@@ -131,8 +282,7 @@ class TunnelConfig:
 
     @interface_ip.setter
     def interface_ip(self, value: str) -> None:
-        self._config["interface_ip"] = value
-        self._save()
+        self._set("interface_ip", value)
 
     @property
     def remote_forward_ip(self) -> str:
@@ -140,8 +290,7 @@ class TunnelConfig:
 
     @remote_forward_ip.setter
     def remote_forward_ip(self, value: str) -> None:
-        self._config["remote_forward_ip"] = value
-        self._save()
+        self._set("remote_forward_ip", value)
 
     @property
     def tunnel_id(self) -> int:
@@ -149,8 +298,7 @@ class TunnelConfig:
 
     @tunnel_id.setter
     def tunnel_id(self, value: int) -> None:
-        self._config["tunnel_id"] = value
-        self._save()
+        self._set("tunnel_id", value)
 
     @property
     def peer_tunnel_id(self) -> int:
@@ -158,8 +306,7 @@ class TunnelConfig:
 
     @peer_tunnel_id.setter
     def peer_tunnel_id(self, value: int) -> None:
-        self._config["peer_tunnel_id"] = value
-        self._save()
+        self._set("peer_tunnel_id", value)
 
     @property
     def session_id(self) -> int:
@@ -167,8 +314,7 @@ class TunnelConfig:
 
     @session_id.setter
     def session_id(self, value: int) -> None:
-        self._config["session_id"] = value
-        self._save()
+        self._set("session_id", value)
 
     @property
     def peer_session_id(self) -> int:
@@ -176,8 +322,7 @@ class TunnelConfig:
 
     @peer_session_id.setter
     def peer_session_id(self, value: int) -> None:
-        self._config["peer_session_id"] = value
-        self._save()
+        self._set("peer_session_id", value)
 
     @property
     def interface_index(self) -> int:
@@ -185,8 +330,7 @@ class TunnelConfig:
 
     @interface_index.setter
     def interface_index(self, value: int) -> None:
-        self._config["interface_index"] = value
-        self._save()
+        self._set("interface_index", value)
 
     @property
     def interface_name(self) -> str:
@@ -199,8 +343,29 @@ class TunnelConfig:
 
     @forwarded_ports.setter
     def forwarded_ports(self, value: List[int]) -> None:
-        self._config["forwarded_ports"] = value
-        self._save()
+        self._set("forwarded_ports", value)
+
+    @property
+    def bulk_ports(self) -> List[int]:
+        """Forwarded ports tuned for throughput (coalesced writes) rather than latency."""
+        return self._config.get("bulk_ports", [])
+
+    @bulk_ports.setter
+    def bulk_ports(self, value: List[int]) -> None:
+        self._set("bulk_ports", value)
+
+    @property
+    def fastopen_ports(self) -> List[int]:
+        """
+        Forwarded ports that connect upstream with TCP Fast Open.
+
+        Only safe for protocols where the client speaks first (HTTP, TLS).
+        """
+        return self._config.get("fastopen_ports", [])
+
+    @fastopen_ports.setter
+    def fastopen_ports(self, value: List[int]) -> None:
+        self._set("fastopen_ports", value)
 
     def get_tunnel_ids(self) -> Dict[str, int]:
         """Get all tunnel IDs as a dictionary."""
@@ -215,13 +380,13 @@ class TunnelConfig:
         """Add a port to forwarded ports list."""
         ports = self.forwarded_ports
         if port not in ports:
-            ports.append(port)
-            self.forwarded_ports = ports
+            # Assign a new list: the setter skips the write when old == new
+            self.forwarded_ports = ports + [port]
 
     def remove_port(self, port: int) -> None:
         """Remove a port from forwarded ports list."""
-        ports = self.forwarded_ports
-        if port in ports:
+        if port in self.forwarded_ports:
+            ports = list(self.forwarded_ports)
             ports.remove(port)
             self.forwarded_ports = ports
 
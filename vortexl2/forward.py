@@ -3,185 +3,481 @@ VortexL2 Port Forward Management
 
 Handles asyncio-based TCP port forwarding with better reliability and control.
 Uses pure Python async I/O instead of socat for better error handling and logging.
+On Linux, payload bytes are moved in-kernel with splice(2).
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import re
+import socket
+import sys
+import time
 from pathlib import Path
 from typing import List, Tuple, Dict, Optional
-from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:  # non-POSIX
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 FORWARDS_STATE_FILE = Path("/var/lib/vortexl2/forwards.json")
 FORWARDS_LOG_DIR = Path("/var/log/vortexl2")
 
+PROC_NET_TCP_FILES = ("/proc/net/tcp", "/proc/net/tcp6")
+TCP_STATE_LISTEN = "0A"
+LISTENING_PORTS_TTL = 1.0  # seconds
+
+# splice(2) needs Linux and Python 3.10+; otherwise relay through a userspace buffer
+_HAS_SPLICE = hasattr(os, "splice")
+_SPLICE_FLAGS = (os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK) if _HAS_SPLICE else 0
+
+# Bytes a relay asks for per move (splice pipe capacity / copy buffer size)
+PIPE_CHUNK = 1 << 20
+
+# Bytes a relay may move between yields to the event loop
+PIPE_HIGH_WATER = 1 << 20
+
+# Accept queue per listening socket (the kernel caps it at net.core.somaxconn)
+LISTEN_BACKLOG = 4096
+
+# Linux >= 4.11; Python doesn't export the constant
+TCP_FASTOPEN_CONNECT = getattr(socket, "TCP_FASTOPEN_CONNECT", 30) if sys.platform.startswith("linux") else None
+
+# One entry of a port list: "443" or an inclusive range "8000-8099"
+_PORT_RE = re.compile(r"(\d+)(?:\s*-\s*(\d+))?")
+
+# Relayed chunks between flushes of the per-session/per-server byte counters
+STATS_FLUSH_CHUNKS = 16
+
+
+_DIRS_READY = False
+
+
+def _ensure_dirs() -> None:
+    """Create the log/state directories once per process."""
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    for directory in (FORWARDS_LOG_DIR, FORWARDS_STATE_FILE.parent):
+        # A stat is enough in the usual case where the directory exists
+        if not directory.is_dir():
+            directory.mkdir(parents=True, exist_ok=True)
+    _DIRS_READY = True
+
+
+def _parse_ports(ports_str: str) -> Tuple[List[int], List[str]]:
+    """
+    Parse "443, 80, 8000-8099" into unique ports (in input order).
+
+    Returns (ports, invalid_entries).
+    """
+    ports: Dict[int, None] = {}
+    invalid: List[str] = []
+    for entry in (ports_str or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        m = _PORT_RE.fullmatch(entry)
+        lo = int(m.group(1)) if m else 0
+        hi = int(m.group(2) or lo) if m else 0
+        if not 1 <= lo <= hi <= 65535:
+            invalid.append(entry)
+            continue
+        ports.update(dict.fromkeys(range(lo, hi + 1)))
+    return list(ports), invalid
+
+
+def _read_listening_inodes() -> Dict[int, int]:
+    """Map socket inode -> local port for every TCP socket in LISTEN state."""
+    listeners: Dict[int, int] = {}
+    for path in PROC_NET_TCP_FILES:
+        try:
+            with open(path, "r") as f:
+                next(f, None)  # header
+                for line in f:
+                    # sl local_address rem_address st tx:rx tr:when retrnsmt uid timeout inode
+                    fields = line.split()
+                    if len(fields) > 9 and fields[3] == TCP_STATE_LISTEN:
+                        port_hex = fields[1].rsplit(":", 1)[1]
+                        listeners[int(fields[9])] = int(port_hex, 16)
+        except (OSError, ValueError, IndexError):
+            continue
+    return listeners
+
+
+def _grow_pipe(fd: int) -> int:
+    """Raise a pipe's capacity to PIPE_CHUNK; returns the capacity in effect."""
+    try:
+        return fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, PIPE_CHUNK)
+    except (AttributeError, OSError):
+        return 65536
+
+
+def _tune_socket(sock: socket.socket, low_latency: bool = True) -> None:
+    """
+    Per-connection socket options for relayed sockets.
+
+    Low-latency sockets get TCP_NODELAY, as asyncio transports set by default.
+    Otherwise TCP_CORK (Linux) coalesces small writes into full segments,
+    trading latency for fewer packets on bulk transfers.
+    SO_RCVBUF/SO_SNDBUF are left alone: fixing them disables kernel autotuning.
+    """
+    try:
+        if low_latency:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        elif hasattr(socket, "TCP_CORK"):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
+    except OSError:
+        pass
+
+
+def _uncork_socket(sock: socket.socket) -> None:
+    """Flush any partial segment held back by TCP_CORK."""
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+    except (AttributeError, OSError):
+        pass
+
+
+async def _wait_ready(fd: int, writable: bool = False) -> None:
+    """Wait until fd is readable (or writable) on the running event loop."""
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+
+    def _ready() -> None:
+        if not fut.done():
+            fut.set_result(None)
+
+    if writable:
+        loop.add_writer(fd, _ready)
+        try:
+            await fut
+        finally:
+            loop.remove_writer(fd)
+    else:
+        loop.add_reader(fd, _ready)
+        try:
+            await fut
+        finally:
+            loop.remove_reader(fd)
+
+
+class _Relay:
+    """
+    Moves bytes from one connected socket to another.
+
+    With splice(2) the data goes socket -> pipe -> socket without ever being
+    copied into Python; otherwise it falls back to sock_recv_into/sock_sendall.
+    """
+
+    def __init__(self, src: socket.socket, dst: socket.socket):
+        self.src = src
+        self.dst = dst
+        self._pipe: Optional[Tuple[int, int]] = None
+        self._pipe_size = 0
+        self._buf: Optional[memoryview] = None
+        self._unyielded = 0
+
+        if _HAS_SPLICE:
+            self._pipe = os.pipe()
+            self._pipe_size = _grow_pipe(self._pipe[1])
+        else:
+            self._buf = memoryview(bytearray(PIPE_CHUNK))
+
+    async def move(self) -> int:
+        """Move one chunk from src to dst. Returns the byte count, 0 on EOF."""
+        n = await (self._copy() if self._pipe is None else self._splice())
+
+        # A busy relay never has to wait; let other sessions run now and then
+        self._unyielded += n
+        if self._unyielded >= PIPE_HIGH_WATER:
+            self._unyielded = 0
+            await asyncio.sleep(0)
+        return n
+
+    async def _copy(self) -> int:
+        loop = asyncio.get_running_loop()
+        n = await loop.sock_recv_into(self.src, self._buf)
+        if n:
+            await loop.sock_sendall(self.dst, self._buf[:n])
+        return n
+
+    async def _splice(self) -> int:
+        pipe_r, pipe_w = self._pipe
+        src_fd = self.src.fileno()
+        while True:
+            try:
+                n = os.splice(src_fd, pipe_w, self._pipe_size, flags=_SPLICE_FLAGS)
+                break
+            except BlockingIOError:
+                await _wait_ready(src_fd)
+
+        # The pipe is always drained before the next read, so it never fills up
+        dst_fd = self.dst.fileno()
+        pending = n
+        while pending:
+            try:
+                pending -= os.splice(pipe_r, dst_fd, pending, flags=_SPLICE_FLAGS)
+            except BlockingIOError:
+                await _wait_ready(dst_fd, writable=True)
+        return n
+
+    def close(self) -> None:
+        """Release the pipe and shut down dst, which also ends the opposite relay."""
+        if self._pipe is not None:
+            for fd in self._pipe:
+                os.close(fd)
+            self._pipe = None
+
+        try:
+            self.dst.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+_SESSION_FIELDS = ("port", "remote_ip", "remote_port", "created_at", "bytes_sent", "bytes_received")
+
 
-@dataclass
 class ForwardSession:
     """Represents an active port forwarding session."""
-    port: int
-    remote_ip: str
-    remote_port: int
-    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
-    bytes_sent: int = 0
-    bytes_received: int = 0
+
+    __slots__ = ("port", "remote_ip", "remote_port", "started", "bytes_sent", "bytes_received")
+
+    def __init__(self, port: int, remote_ip: str, remote_port: int):
+        self.port = port
+        self.remote_ip = remote_ip
+        self.remote_port = remote_port
+        self.started = time.time()  # formatted only when asked for
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    @property
+    def created_at(self) -> str:
+        return datetime.fromtimestamp(self.started).isoformat()
 
     def to_dict(self) -> Dict[str, object]:
-        return {
-            "port": self.port,
-            "remote_ip": self.remote_ip,
-            "remote_port": self.remote_port,
-            "created_at": self.created_at,
-            "bytes_sent": self.bytes_sent,
-            "bytes_received": self.bytes_received,
-        }
+        return {k: getattr(self, k) for k in _SESSION_FIELDS}
 
 
 class ForwardServer:
     """Manages a single port forward server using asyncio."""
 
-    def __init__(self, port: int, remote_ip: str, remote_port: Optional[int] = None):
+    def __init__(self, port: int, remote_ip: str, remote_port: Optional[int] = None,
+                 low_latency: bool = True, fast_open: bool = False):
         self.port = int(port)
         self.remote_ip = remote_ip
         self.remote_port = int(remote_port) if remote_port is not None else int(port)
+        self.low_latency = low_latency
+        # TFO defers the SYN until the first write, so it would stall
+        # protocols where the server speaks first; opt-in per port
+        self.fast_open = fast_open and TCP_FASTOPEN_CONNECT is not None
 
-        self.server: Optional[asyncio.AbstractServer] = None
+        self.server_sock: Optional[socket.socket] = None
         self.running: bool = False
-        self.active_sessions: List[ForwardSession] = []
+        self.active_sessions: Dict[int, ForwardSession] = {}
+        self._next_sid = 0
+
+        self._accept_task: Optional[asyncio.Task] = None
+        self._client_tasks: set = set()
+
+        self._connections = 0
+        self._errors = 0
+        self._tx = 0  # client -> remote bytes
+        self._rx = 0  # remote -> client bytes
 
-        self.stats: Dict[str, int] = {
-            "connections": 0,
-            "total_bytes_sent": 0,
-            "total_bytes_received": 0,
-            "errors": 0,
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "connections": self._connections,
+            "total_bytes_sent": self._tx,
+            "total_bytes_received": self._rx,
+            "errors": self._errors,
         }
 
-    async def _pipe(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
-                    session: ForwardSession, direction: str) -> None:
+    async def _pipe_c2r(self, client: socket.socket, remote: socket.socket,
+                        session: ForwardSession) -> None:
+        relay = _Relay(client, remote)
+        acc = chunks = 0
         try:
             while True:
-                data = await reader.read(65536)
-                if not data:
+                n = await relay.move()
+                if not n:
                     break
-
-                if direction == "client->remote":
-                    session.bytes_sent += len(data)
-                    self.stats["total_bytes_sent"] += len(data)
-                else:
-                    session.bytes_received += len(data)
-                    self.stats["total_bytes_received"] += len(data)
-
-                writer.write(data)
-                await writer.drain()
+                acc += n
+                chunks += 1
+                if chunks == STATS_FLUSH_CHUNKS:
+                    session.bytes_sent += acc
+                    self._tx += acc
+                    acc = chunks = 0
         except Exception as e:
-            logger.debug("Pipe error (%s) on port %s: %s", direction, self.port, e)
+            logger.debug("Pipe error (client->remote) on port %s: %s", self.port, e)
         finally:
-            try:
-                writer.close()
-                await writer.wait_closed()
-            except Exception:
-                pass
+            session.bytes_sent += acc
+            self._tx += acc
+            relay.close()
+
+    async def _pipe_r2c(self, remote: socket.socket, client: socket.socket,
+                        session: ForwardSession) -> None:
+        relay = _Relay(remote, client)
+        acc = chunks = 0
+        try:
+            while True:
+                n = await relay.move()
+                if not n:
+                    break
+                acc += n
+                chunks += 1
+                if chunks == STATS_FLUSH_CHUNKS:
+                    session.bytes_received += acc
+                    self._rx += acc
+                    acc = chunks = 0
+        except Exception as e:
+            logger.debug("Pipe error (remote->client) on port %s: %s", self.port, e)
+        finally:
+            session.bytes_received += acc
+            self._rx += acc
+            relay.close()
 
-    async def handle_client(self, local_reader: asyncio.StreamReader, local_writer: asyncio.StreamWriter) -> None:
-        client_addr = local_writer.get_extra_info("peername")
+    async def handle_client(self, client: socket.socket, client_addr) -> None:
+        loop = asyncio.get_running_loop()
         session = ForwardSession(port=self.port, remote_ip=self.remote_ip, remote_port=self.remote_port)
-        self.active_sessions.append(session)
-        self.stats["connections"] += 1
+        sid = self._next_sid
+        self._next_sid += 1
+        self.active_sessions[sid] = session
+        self._connections += 1
 
-        remote_reader: Optional[asyncio.StreamReader] = None
-        remote_writer: Optional[asyncio.StreamWriter] = None
+        remote: Optional[socket.socket] = None
 
         try:
+            _tune_socket(client, self.low_latency)
             logger.info("Forward client %s connected on :%s -> %s:%s",
                         client_addr, self.port, self.remote_ip, self.remote_port)
 
             try:
-                remote_reader, remote_writer = await asyncio.wait_for(
-                    asyncio.open_connection(self.remote_ip, self.remote_port),
+                remote = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                remote.setblocking(False)
+                _tune_socket(remote, self.low_latency)
+                if self.fast_open:
+                    try:
+                        remote.setsockopt(socket.IPPROTO_TCP, TCP_FASTOPEN_CONNECT, 1)
+                    except OSError:
+                        pass
+                await asyncio.wait_for(
+                    loop.sock_connect(remote, (self.remote_ip, self.remote_port)),
                     timeout=10,
                 )
             except asyncio.TimeoutError:
-                self.stats["errors"] += 1
+                self._errors += 1
                 logger.error("Timeout connecting to %s:%s for local port %s",
                              self.remote_ip, self.remote_port, self.port)
                 return
             except Exception as e:
-                self.stats["errors"] += 1
+                self._errors += 1
                 logger.error("Failed to connect to %s:%s for local port %s: %s",
                              self.remote_ip, self.remote_port, self.port, e)
                 return
 
-            t1 = asyncio.create_task(self._pipe(local_reader, remote_writer, session, "client->remote"))
-            t2 = asyncio.create_task(self._pipe(remote_reader, local_writer, session, "remote->client"))
-            await asyncio.gather(t1, t2)
+            pipes = {
+                asyncio.create_task(self._pipe_c2r(client, remote, session)),
+                asyncio.create_task(self._pipe_r2c(remote, client, session)),
+            }
+            # Once either direction ends the session is over; don't wait for
+            # the other one to notice (it may be stuck on an unwritable peer)
+            try:
+                await asyncio.wait(pipes, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                for task in pipes:
+                    task.cancel()
+                await asyncio.gather(*pipes, return_exceptions=True)
 
         except Exception as e:
-            self.stats["errors"] += 1
+            self._errors += 1
             logger.error("Error handling client %s on port %s: %s", client_addr, self.port, e)
         finally:
-            # best-effort close
-            try:
-                local_writer.close()
-                await local_writer.wait_closed()
-            except Exception:
-                pass
+            if not self.low_latency:
+                _uncork_socket(client)
+                if remote:
+                    _uncork_socket(remote)
 
-            try:
-                if remote_writer:
-                    remote_writer.close()
-                    await remote_writer.wait_closed()
-            except Exception:
-                pass
+            client.close()
+            if remote:
+                remote.close()
 
-            try:
-                self.active_sessions.remove(session)
-            except ValueError:
-                pass
+            self.active_sessions.pop(sid, None)
 
             logger.info("Forward client %s disconnected from :%s", client_addr, self.port)
 
     async def start(self) -> bool:
         """Start the forward server (runs forever until stopped)."""
+        loop = asyncio.get_running_loop()
         try:
-            self.server = await asyncio.start_server(
-                self.handle_client,
-                host="0.0.0.0",
-                port=self.port,
-                reuse_address=True,
-            )
-            self.running = True
-            logger.info("Forward server listening on 0.0.0.0:%s -> %s:%s",
-                        self.port, self.remote_ip, self.remote_port)
-
-            async with self.server:
-                await self.server.serve_forever()
-            return True
-        except asyncio.CancelledError:
-            # normal when daemon stops
-            return True
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                # Lets several daemon workers bind the same port; the kernel
+                # then spreads incoming connections across their accept queues
+                if hasattr(socket, "SO_REUSEPORT"):
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                sock.bind(("0.0.0.0", self.port))
+                sock.listen(LISTEN_BACKLOG)
+                sock.setblocking(False)
+            except BaseException:
+                sock.close()
+                raise
         except OSError as e:
             self.running = False
-            self.stats["errors"] += 1
+            self._errors += 1
             logger.error("Failed to bind/listen on port %s: %s", self.port, e)
             return False
+
+        self.server_sock = sock
+        self._accept_task = asyncio.current_task()
+        self.running = True
+        logger.info("Forward server listening on 0.0.0.0:%s -> %s:%s",
+                    self.port, self.remote_ip, self.remote_port)
+
+        try:
+            while True:
+                try:
+                    client, client_addr = await loop.sock_accept(sock)
+                except OSError as e:
+                    # e.g. EMFILE: keep serving, but don't spin
+                    self._errors += 1
+                    logger.error("Accept failed on port %s: %s", self.port, e)
+                    await asyncio.sleep(0.1)
+                    continue
+
+                task = asyncio.create_task(self.handle_client(client, client_addr))
+                self._client_tasks.add(task)
+                task.add_done_callback(self._client_tasks.discard)
+        except asyncio.CancelledError:
+            # normal when daemon stops
+            return True
         except Exception as e:
-            self.running = False
-            self.stats["errors"] += 1
+            self._errors += 1
             logger.error("Forward server error on port %s: %s", self.port, e)
             return False
+        finally:
+            self.running = False
+            self._accept_task = None
+            self.server_sock = None
+            sock.close()
 
     async def stop(self) -> None:
         """Stop the forward server."""
         self.running = False
-        if self.server:
+        task = self._accept_task
+        if task and task is not asyncio.current_task():
+            task.cancel()
             try:
-                self.server.close()
-                await self.server.wait_closed()
-            except Exception:
+                await task
+            except asyncio.CancelledError:
                 pass
         logger.info("Forward server stopped on port %s", self.port)
 
@@ -201,10 +497,17 @@ class ForwardManager:
     def __init__(self, config):
         self.config = config
         self.servers: Dict[int, ForwardServer] = {}
+        self._lports_cache: Tuple[float, set] = (0.0, set())
 
         # Ensure log dir exists (even if we don't write files here)
-        FORWARDS_LOG_DIR.mkdir(parents=True, exist_ok=True)
-        FORWARDS_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _ensure_dirs()
+
+    def _new_server(self, port: int, remote_ip: str) -> ForwardServer:
+        bulk_ports = getattr(self.config, "bulk_ports", [])
+        fastopen_ports = getattr(self.config, "fastopen_ports", [])
+        return ForwardServer(port, remote_ip, remote_port=port,
+                             low_latency=port not in bulk_ports,
+                             fast_open=port in fastopen_ports)
 
     def create_forward(self, port: int) -> Tuple[bool, str]:
         remote_ip = getattr(self.config, "remote_forward_ip", None)
@@ -215,7 +518,7 @@ class ForwardManager:
         if port in self.servers:
             return False, f"Port {port} already forwarding"
 
-        self.servers[port] = ForwardServer(port, remote_ip, remote_port=port)
+        self.servers[port] = self._new_server(port, remote_ip)
 
         # Persist in config
         self.config.add_port(port)
@@ -234,36 +537,48 @@ class ForwardManager:
 
     def add_multiple_forwards(self, ports_str: str) -> Tuple[bool, str]:
         results: List[str] = []
-        ports = [p.strip() for p in (ports_str or "").split(",") if p.strip()]
+        ports, invalid = _parse_ports(ports_str)
 
-        for port_str in ports:
-            try:
-                port = int(port_str)
+        # One config write for the whole list instead of one per port
+        with self.config.batch():
+            for port in ports:
                 success, msg = self.create_forward(port)
                 results.append(f"Port {port}: {msg}")
-            except ValueError:
-                results.append(f"Port '{port_str}': Invalid port number")
+
+        results.extend(f"Port '{entry}': Invalid port number" for entry in invalid)
 
         return True, "\n".join(results) if results else "No ports provided"
 
     def remove_multiple_forwards(self, ports_str: str) -> Tuple[bool, str]:
         results: List[str] = []
-        ports = [p.strip() for p in (ports_str or "").split(",") if p.strip()]
+        ports, invalid = _parse_ports(ports_str)
 
-        for port_str in ports:
-            try:
-                port = int(port_str)
+        # One config write for the whole list instead of one per port
+        with self.config.batch():
+            for port in ports:
                 success, msg = self.remove_forward(port)
                 results.append(f"Port {port}: {msg}")
-            except ValueError:
-                results.append(f"Port '{port_str}': Invalid port number")
+
+        results.extend(f"Port '{entry}': Invalid port number" for entry in invalid)
 
         return True, "\n".join(results) if results else "No ports provided"
 
-    def list_forwards(self) -> List[Dict[str, object]]:
-        """List all configured port forwards with their status."""
+    def list_forwards(self, verify: bool = False) -> List[Dict[str, object]]:
+        """
+        List all configured port forwards with their status.
+
+        By default running state comes from this manager's own servers. Pass
+        verify=True to probe the OS instead, e.g. when the servers live in the
+        forward daemon rather than this process.
+        """
         forwards: List[Dict[str, object]] = []
-        listening_ports = self._get_listening_ports()
+        if verify:
+            listening_ports = self._get_listening_ports()
+        else:
+            listening_ports = {
+                port for port, server in self.servers.items()
+                if server.running and server.server_sock is not None
+            }
 
         remote_ip = getattr(self.config, "remote_forward_ip", None) or "-"
 
@@ -273,7 +588,7 @@ class ForwardManager:
 
             if port in self.servers:
                 status = self.servers[port].get_status()
-                # reflect actual system state
+                # reflect actual listener state
                 status["running"] = is_running
                 forwards.append(status)
             else:
@@ -287,29 +602,50 @@ class ForwardManager:
         return forwards
 
     def _get_listening_ports(self) -> set:
+        """Listening ports, re-probed at most once per LISTENING_PORTS_TTL."""
+        now = time.monotonic()
+        ts, ports = self._lports_cache
+        if ts and now - ts < LISTENING_PORTS_TTL:
+            return ports
+
+        ports = self._probe_listening_ports()
+        self._lports_cache = (now, ports)
+        return ports
+
+    def _probe_listening_ports(self) -> set:
         """Best-effort: detect which ports this python process family is listening on."""
-        import subprocess
+        listeners = _read_listening_inodes()
+        if not listeners:
+            return set()
 
+        ports = set()
         try:
-            result = subprocess.run(
-                "ss -tlnp | grep python | grep -oP ':\\K[0-9]+(?=\\s)'",
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                ports = set()
-                for line in result.stdout.strip().split("\n"):
-                    try:
-                        ports.add(int(line.strip()))
-                    except ValueError:
-                        pass
-                return ports
-        except Exception:
-            pass
+            pids = [p for p in os.listdir("/proc") if p.isdigit()]
+        except OSError:
+            return ports
+
+        for pid in pids:
+            try:
+                with open(f"/proc/{pid}/comm", "r") as f:
+                    if "python" not in f.read():
+                        continue
+                fd_dir = f"/proc/{pid}/fd"
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue
+
+            for fd in fds:
+                try:
+                    link = os.readlink(f"{fd_dir}/{fd}")
+                except OSError:
+                    continue
+                # socket fds read as "socket:[<inode>]"
+                if link.startswith("socket:["):
+                    port = listeners.get(int(link[8:-1]))
+                    if port is not None:
+                        ports.add(port)
 
-        return set()
+        return ports
 
     async def start_all_forwards(self) -> Tuple[bool, str]:
         """Start all configured port forwards asynchronously (non-blocking)."""
@@ -326,7 +662,7 @@ class ForwardManager:
             port = int(port)
 
             if port not in self.servers:
-                self.servers[port] = ForwardServer(port, remote_ip, remote_port=port)
+                self.servers[port] = self._new_server(port, remote_ip)
 
             server = self.servers[port]
             if server.running:
@@ -118,5 +118,16 @@ async def main():
         sys.exit(1)
 
 
+def use_uvloop():
+    """Use uvloop's libuv-based event loop when it is installed (optional dependency)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+
+
 if __name__ == "__main__":
+    use_uvloop()
     asyncio.run(main())
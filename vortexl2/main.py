@@ -16,7 +16,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from vortexl2 import __version__
 from vortexl2.config import TunnelConfig, ConfigManager
-from vortexl2.tunnel import TunnelManager
+from vortexl2.tunnel import TunnelManager, run_command_stream
 from vortexl2.forward import ForwardManager
 from vortexl2 import ui
 
@@ -38,8 +38,7 @@ def check_root():
 def restart_forward_daemon():
     """Restart the forward daemon service to pick up config changes."""
     subprocess.run(
-        "systemctl restart vortexl2-forward-daemon",
-        shell=True,
+        ["systemctl", "restart", "vortexl2-forward-daemon"],
         capture_output=True
     )
 
@@ -170,8 +169,9 @@ def handle_delete_tunnel(manager: ConfigManager):
         if config.forwarded_ports:
             ui.show_info("Clearing port forwards from config...")
             ports_to_remove = list(config.forwarded_ports)  # Copy list since we're modifying it
-            for port in ports_to_remove:
-                forward.remove_forward(port)
+            with config.batch():
+                for port in ports_to_remove:
+                    forward.remove_forward(port)
             ui.show_success(f"Removed {len(ports_to_remove)} port forward(s) from config")
         
         # Stop tunnel
@@ -208,8 +208,8 @@ def handle_forwards_menu(manager: ConfigManager):
         ui.console.print(f"[bold]Managing forwards for tunnel: [magenta]{config.name}[/][/]\n")
         ui.console.print("[yellow]Note: Forward daemon will manage actual port forwarding[/]\n")
         
-        # Show current forwards
-        forwards = forward.list_forwards()
+        # Show current forwards (servers run in the daemon, so ask the OS)
+        forwards = forward.list_forwards(verify=True)
         if forwards:
             ui.show_forwards_list(forwards)
         
@@ -247,12 +247,12 @@ def handle_forwards_menu(manager: ConfigManager):
             ui.wait_for_enter()
         elif choice == "5":
             # Stop daemon
-            subprocess.run("systemctl stop vortexl2-forward-daemon", shell=True)
+            subprocess.run(["systemctl", "stop", "vortexl2-forward-daemon"])
             ui.show_success("Forward daemon stopped.")
             ui.wait_for_enter()
         elif choice == "6":
             # Start daemon
-            subprocess.run("systemctl start vortexl2-forward-daemon", shell=True)
+            subprocess.run(["systemctl", "start", "vortexl2-forward-daemon"])
             ui.show_success("Forward daemon started.")
             ui.wait_for_enter()
 
@@ -267,14 +267,8 @@ def handle_logs(manager: ConfigManager):
     ]
     
     for service in services:
-        result = subprocess.run(
-            f"journalctl -u {service} -n 20 --no-pager",
-            shell=True,
-            capture_output=True,
-            text=True
-        )
-        output = result.stdout or result.stderr or "No logs available"
-        ui.show_output(output, f"Logs: {service}")
+        lines = run_command_stream(["journalctl", "-u", service, "-n", "20", "--no-pager"])
+        ui.show_output_stream(lines, f"Logs: {service}", empty="No logs available")
     
     ui.wait_for_enter()
 
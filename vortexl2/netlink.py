@@ -0,0 +1,138 @@
+"""
+VortexL2 L2TP Netlink Queries
+
+Reads the kernel's L2TP tunnel and session tables over generic netlink,
+so existence checks don't have to spawn `ip l2tp show` and parse its text.
+"""
+
+import os
+import socket
+import struct
+from typing import Dict, List, Optional, Set, Tuple
+
+NETLINK_GENERIC = getattr(socket, "NETLINK_GENERIC", 16)
+
+# linux/netlink.h
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+
+# linux/genetlink.h
+GENL_ID_CTRL = 0x10
+CTRL_CMD_GETFAMILY = 3
+CTRL_ATTR_FAMILY_ID = 1
+CTRL_ATTR_FAMILY_NAME = 2
+
+# linux/l2tp.h
+L2TP_GENL_NAME = "l2tp"
+L2TP_GENL_VERSION = 1
+L2TP_CMD_TUNNEL_GET = 4
+L2TP_CMD_SESSION_GET = 8
+L2TP_ATTR_CONN_ID = 9
+L2TP_ATTR_SESSION_ID = 11
+
+_NLMSG_HDR = struct.Struct("=IHHII")
+_GENL_HDR = struct.Struct("=BBH")
+_NLA_HDR = struct.Struct("=HH")
+_U16 = struct.Struct("=H")
+_U32 = struct.Struct("=I")
+_NLA_TYPE_MASK = 0x3FFF
+
+_RECV_SIZE = 65536
+_TIMEOUT = 1.0
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def _attr(attr_type: int, payload: bytes) -> bytes:
+    """Encode one netlink attribute, padded to 4 bytes."""
+    length = _NLA_HDR.size + len(payload)
+    return _NLA_HDR.pack(length, attr_type) + payload + b"\0" * (_align(length) - length)
+
+
+def _parse_attrs(data: bytes, offset: int, end: int) -> Dict[int, bytes]:
+    """Decode the top-level attributes in data[offset:end]."""
+    attrs = {}
+    while offset + _NLA_HDR.size <= end:
+        length, attr_type = _NLA_HDR.unpack_from(data, offset)
+        if length < _NLA_HDR.size:
+            break
+        attrs[attr_type & _NLA_TYPE_MASK] = data[offset + _NLA_HDR.size:offset + length]
+        offset += _align(length)
+    return attrs
+
+
+def _request(sock: socket.socket, family: int, cmd: int, version: int,
+             attrs: bytes = b"", dump: bool = False) -> List[Dict[int, bytes]]:
+    """Send one generic netlink request and collect the attributes of every reply."""
+    flags = NLM_F_REQUEST | (NLM_F_DUMP if dump else 0)
+    payload = _GENL_HDR.pack(cmd, version, 0) + attrs
+    sock.send(_NLMSG_HDR.pack(_NLMSG_HDR.size + len(payload), family, flags, 1, 0) + payload)
+
+    replies = []
+    while True:
+        data = sock.recv(_RECV_SIZE)
+        offset = 0
+        while offset + _NLMSG_HDR.size <= len(data):
+            length, msg_type = _NLMSG_HDR.unpack_from(data, offset)[:2]
+            if length < _NLMSG_HDR.size:
+                raise OSError("Malformed netlink message")
+            body = offset + _NLMSG_HDR.size
+            if msg_type == NLMSG_DONE:
+                return replies
+            if msg_type == NLMSG_ERROR:
+                error = struct.unpack_from("=i", data, body)[0]
+                if error:
+                    raise OSError(-error, os.strerror(-error))
+                return replies
+            replies.append(_parse_attrs(data, body + _GENL_HDR.size, offset + length))
+            offset += _align(length)
+        if not dump:
+            return replies
+
+
+def _dump_l2tp(cmd: int) -> Optional[List[Dict[int, bytes]]]:
+    """Dump one L2TP table, or None if generic netlink/L2TP is unavailable."""
+    if not hasattr(socket, "AF_NETLINK"):
+        return None
+    try:
+        with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_GENERIC) as sock:
+            sock.settimeout(_TIMEOUT)
+            sock.bind((0, 0))
+            name = _attr(CTRL_ATTR_FAMILY_NAME, L2TP_GENL_NAME.encode() + b"\0")
+            family = None
+            for reply in _request(sock, GENL_ID_CTRL, CTRL_CMD_GETFAMILY, 1, name):
+                if CTRL_ATTR_FAMILY_ID in reply:
+                    family = _U16.unpack_from(reply[CTRL_ATTR_FAMILY_ID])[0]
+            if family is None:
+                return None
+            return _request(sock, family, cmd, L2TP_GENL_VERSION, dump=True)
+    except (OSError, struct.error):
+        return None
+
+
+def l2tp_tunnel_ids() -> Optional[Set[int]]:
+    """IDs of the kernel's L2TP tunnels, or None if they can't be read over netlink."""
+    replies = _dump_l2tp(L2TP_CMD_TUNNEL_GET)
+    if replies is None:
+        return None
+    return {
+        _U32.unpack_from(reply[L2TP_ATTR_CONN_ID])[0]
+        for reply in replies if L2TP_ATTR_CONN_ID in reply
+    }
+
+
+def l2tp_session_ids() -> Optional[Set[Tuple[int, int]]]:
+    """(tunnel_id, session_id) of the kernel's L2TP sessions, or None if unreadable."""
+    replies = _dump_l2tp(L2TP_CMD_SESSION_GET)
+    if replies is None:
+        return None
+    return {
+        (_U32.unpack_from(reply[L2TP_ATTR_CONN_ID])[0],
+         _U32.unpack_from(reply[L2TP_ATTR_SESSION_ID])[0])
+        for reply in replies
+        if L2TP_ATTR_CONN_ID in reply and L2TP_ATTR_SESSION_ID in reply
+    }
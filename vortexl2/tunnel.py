@@ -4,53 +4,325 @@ VortexL2 L2TPv3 Tunnel Management
 Handles L2TPv3 tunnel and session creation/deletion using iproute2.
 """
 
+import io
+import os
+import shutil
 import subprocess
 import re
-from typing import Optional, Dict, Tuple, List
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, Iterator, Tuple, List, NamedTuple, Sequence, Set, Union
 from dataclasses import dataclass
 
+from .netlink import l2tp_tunnel_ids, l2tp_session_ids
 
-@dataclass
-class CommandResult:
-    """Result of a shell command execution."""
+
+# Set VORTEXL2_STRICT_MATCH=1 to match `ip l2tp show` output with whitespace-tolerant
+# regexes instead of the default literal substring checks
+_STRICT_MATCH = os.environ.get("VORTEXL2_STRICT_MATCH") == "1"
+
+PROC_MODULES = "/proc/modules"
+L2TP_MODULES = ("l2tp_core", "l2tp_netlink", "l2tp_eth")
+SYS_CLASS_NET = "/sys/class/net"
+
+# How long check_*_exists may reuse a tunnel/session listing (e.g. while polling status)
+CHECK_CACHE_TTL = 0.5  # seconds
+
+# How long bring_up_interface waits for the session's netdev to appear
+INTERFACE_WAIT = 0.5  # seconds
+INTERFACE_POLL = 0.01  # seconds
+
+SHOW_TUNNELS = ["ip", "l2tp", "show", "tunnel"]
+SHOW_SESSIONS = ["ip", "l2tp", "show", "session"]
+
+_IFACE_IP_RE = re.compile(r"inet\s+(\d+\.\d+\.\d+\.\d+/\d+)")
+
+# `ip -batch` stops at the first failing line and reports it as "Command failed -:N"
+_BATCH_FAILED_RE = re.compile(r"^Command failed -:(\d+)$", re.MULTILINE)
+
+
+@lru_cache(maxsize=64)
+def _tunnel_re(tunnel_id: int) -> "re.Pattern":
+    """Compiled matcher for a tunnel line in `ip l2tp show tunnel` output."""
+    return re.compile(rf"Tunnel\s+{tunnel_id},".encode())
+
+
+@lru_cache(maxsize=64)
+def _session_re(tunnel_id: int, session_id: int) -> "re.Pattern":
+    """Compiled matcher for a session line in `ip l2tp show session` output."""
+    return re.compile(rf"Session\s+{session_id}\s+in\s+tunnel\s+{tunnel_id}\b".encode())
+
+
+def _interface_ip(output: str) -> Optional[str]:
+    """First IPv4 address/prefix in `ip addr show` output, matched only on its `inet` line."""
+    for line in output.splitlines():
+        line = line.lstrip()
+        if line.startswith("inet "):
+            ip_match = _IFACE_IP_RE.match(line)
+            return ip_match.group(1) if ip_match else None
+    return None
+
+
+def _has_tunnel(output: bytes, tunnel_id: int) -> bool:
+    """Whether `ip l2tp show tunnel` output lists tunnel_id ("Tunnel 1000, encap IP")."""
+    if _STRICT_MATCH:
+        return bool(_tunnel_re(tunnel_id).search(output))
+    return f"Tunnel {tunnel_id},".encode() in output
+
+
+def _has_session(output: bytes, tunnel_id: int, session_id: int) -> bool:
+    """Whether `ip l2tp show session` output lists the session ("Session 10 in tunnel 1000")."""
+    if _STRICT_MATCH:
+        return bool(_session_re(tunnel_id, session_id).search(output))
+    # Line-terminated, so tunnel 1000 doesn't match "... in tunnel 10000"
+    needle = f"Session {session_id} in tunnel {tunnel_id}".encode()
+    return needle + b"\n" in output or output.endswith(needle)
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", "replace")
+
+
+class CommandResult(NamedTuple):
+    """
+    Result of a shell command execution (a tuple, so no per-instance __dict__).
+    
+    stdout is kept as raw bytes, since callers mostly do substring checks on it;
+    use .output for text. stderr is only shown to users, so it is decoded.
+    """
     success: bool
-    stdout: str
+    stdout: bytes
     stderr: str
     returncode: int
+    
+    @property
+    def output(self) -> str:
+        """stdout decoded as text."""
+        return _decode(self.stdout)
 
 
-def run_command(cmd: str, check: bool = False) -> CommandResult:
-    """Execute a shell command and return result."""
+def run_command(cmd: Union[str, Sequence[str]], check: bool = False) -> CommandResult:
+    """
+    Execute a command and return result.
+    
+    An argv list is exec'd directly; a string is run through /bin/sh and
+    should only be used when shell syntax is really needed.
+    """
     try:
         result = subprocess.run(
             cmd,
-            shell=True,
+            shell=isinstance(cmd, str),
             capture_output=True,
-            text=True,
             timeout=30
         )
         return CommandResult(
             success=(result.returncode == 0),
             stdout=result.stdout.strip(),
-            stderr=result.stderr.strip(),
+            stderr=_decode(result.stderr).strip(),
             returncode=result.returncode
         )
     except subprocess.TimeoutExpired:
         return CommandResult(
             success=False,
-            stdout="",
+            stdout=b"",
             stderr="Command timed out",
             returncode=-1
         )
     except Exception as e:
         return CommandResult(
             success=False,
-            stdout="",
+            stdout=b"",
             stderr=str(e),
             returncode=-1
         )
 
 
+def run_command_stream(cmd: Sequence[str], max_lines: int = 10000) -> Iterator[str]:
+    """
+    Execute a command and yield its output (stdout and stderr) line by line as it arrives.
+    
+    Stops after max_lines; closing the iterator early kills the command.
+    """
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            text=True
+        )
+    except Exception as e:
+        yield str(e)
+        return
+    
+    try:
+        for count, line in enumerate(proc.stdout, 1):
+            yield line.rstrip()
+            if count >= max_lines:
+                break
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+
+
+def run_ip_batch(lines: List[str]) -> CommandResult:
+    """Run several `ip` commands (without the leading "ip") through one `ip -batch -` process."""
+    try:
+        result = subprocess.run(
+            ["ip", "-batch", "-"],
+            input=("\n".join(lines) + "\n").encode(),
+            capture_output=True,
+            timeout=30
+        )
+        return CommandResult(
+            success=(result.returncode == 0),
+            stdout=result.stdout.strip(),
+            stderr=_decode(result.stderr).strip(),
+            returncode=result.returncode
+        )
+    except subprocess.TimeoutExpired:
+        return CommandResult(
+            success=False,
+            stdout=b"",
+            stderr="Command timed out",
+            returncode=-1
+        )
+    except Exception as e:
+        return CommandResult(
+            success=False,
+            stdout=b"",
+            stderr=str(e),
+            returncode=-1
+        )
+
+
+def _loaded_modules() -> Set[str]:
+    """Names of the currently loaded kernel modules."""
+    try:
+        with open(PROC_MODULES) as f:
+            return {line.split(" ", 1)[0] for line in f}
+    except OSError:
+        return set()
+
+
+def _batch_failure(result: CommandResult) -> Tuple[int, str]:
+    """Index of the batch line that failed and its error text (0 if ip never got that far)."""
+    match = _BATCH_FAILED_RE.search(result.stderr)
+    if not match:
+        return 0, result.stderr
+    error = _BATCH_FAILED_RE.sub("", result.stderr).strip()
+    return int(match.group(1)) - 1, error
+
+
+class StepLog:
+    """Progress messages of a multi-step operation, one per line."""
+    
+    def __init__(self):
+        self._buf = io.StringIO()
+    
+    def step(self, msg: str):
+        self._buf.write(msg)
+        self._buf.write("\n")
+    
+    def getvalue(self) -> str:
+        # Drop the newline after the last step
+        return self._buf.getvalue()[:-1]
+
+
+# Status queries are independent `ip` processes; run them side by side
+_EXECUTOR = ThreadPoolExecutor(max_workers=3, thread_name_prefix="vortexl2-ip")
+
+
+def _run_parallel(cmds: List[List[str]]) -> List[CommandResult]:
+    """Run commands concurrently and return their results in order."""
+    futures = [_EXECUTOR.submit(run_command, cmd) for cmd in cmds]
+    return [future.result() for future in futures]
+
+
+@dataclass
+class L2tpSnapshot:
+    """
+    L2TP tunnel/session state captured once per operation.
+    
+    Filled from netlink (tunnel_ids/session_ids) when possible, otherwise
+    from `ip l2tp show tunnel`/`show session` output.
+    """
+    tunnels: bytes
+    sessions: bytes
+    ts: float
+    tunnels_error: str = ""
+    sessions_error: str = ""
+    tunnel_ids: Optional[Set[int]] = None
+    session_ids: Optional[Set[Tuple[int, int]]] = None
+    
+    @property
+    def has_text(self) -> bool:
+        """Whether this snapshot carries the `ip l2tp show` text."""
+        return self.tunnel_ids is None
+    
+    def has_tunnel(self, tunnel_id: int) -> bool:
+        if self.tunnel_ids is not None:
+            return tunnel_id in self.tunnel_ids
+        return _has_tunnel(self.tunnels, tunnel_id)
+    
+    def has_session(self, tunnel_id: int, session_id: int) -> bool:
+        if self.session_ids is not None:
+            return (tunnel_id, session_id) in self.session_ids
+        return _has_session(self.sessions, tunnel_id, session_id)
+
+
+def _fetch_snapshot(text: bool = False) -> L2tpSnapshot:
+    """Read the tunnel/session tables, over netlink unless text asks for the `ip` output."""
+    if not text:
+        tunnel_ids = l2tp_tunnel_ids()
+        session_ids = l2tp_session_ids() if tunnel_ids is not None else None
+        if session_ids is not None:
+            return L2tpSnapshot(
+                tunnels=b"",
+                sessions=b"",
+                ts=time.monotonic(),
+                tunnel_ids=tunnel_ids,
+                session_ids=session_ids,
+            )
+    
+    tunnels, sessions = _run_parallel([SHOW_TUNNELS, SHOW_SESSIONS])
+    return L2tpSnapshot(
+        tunnels=tunnels.stdout if tunnels.success else b"",
+        sessions=sessions.stdout if sessions.success else b"",
+        ts=time.monotonic(),
+        tunnels_error="" if tunnels.success else tunnels.stderr,
+        sessions_error="" if sessions.success else sessions.stderr,
+    )
+
+
+class _CheckCache:
+    """The latest L2tpSnapshot, shared by every TunnelManager until it expires or is cleared."""
+    
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snap: Optional[L2tpSnapshot] = None
+    
+    def get(self, max_age: Optional[float] = None, text: bool = False) -> Optional[L2tpSnapshot]:
+        snap = self._snap
+        if snap is None or (text and not snap.has_text):
+            return None
+        if time.monotonic() - snap.ts > (self.ttl if max_age is None else max_age):
+            return None
+        return snap
+    
+    def put(self, snap: L2tpSnapshot):
+        self._snap = snap
+    
+    def cache_clear(self):
+        self._snap = None
+
+
+_CHECK_CACHE = _CheckCache(CHECK_CACHE_TTL)
+
+
 class TunnelManager:
     """Manages L2TPv3 tunnel and session operations for a specific tunnel config."""
     
@@ -63,6 +335,23 @@ class TunnelManager:
         """
         self.config = config
     
+    def _snapshot(self, max_age: float = 0.2, text: bool = False) -> L2tpSnapshot:
+        """
+        Current tunnel/session listing, reused for max_age seconds until a change is made.
+        
+        Reads the kernel tables over netlink unless text asks for the `ip` output.
+        """
+        snap = _CHECK_CACHE.get(max_age, text)
+        if snap is None:
+            snap = _fetch_snapshot(text)
+            _CHECK_CACHE.put(snap)
+        return snap
+    
+    @staticmethod
+    def _invalidate():
+        """Forget cached listings after adding or deleting a tunnel or session."""
+        _CHECK_CACHE.cache_clear()
+    
     @property
     def interface_name(self) -> str:
         """Get the interface name for this tunnel."""
@@ -70,74 +359,72 @@ class TunnelManager:
     
     def install_prerequisites(self) -> Tuple[bool, str]:
         """Install required packages and load kernel modules."""
-        steps = []
+        steps = StepLog()
+        
+        # Warm path: nothing to install or load
+        loaded = _loaded_modules()
+        if loaded.issuperset(L2TP_MODULES) and shutil.which("ip"):
+            return True, "Already installed: L2TP modules loaded and iproute2 present"
         
         # Get kernel version
-        result = run_command("uname -r")
-        if not result.success:
+        kernel_version = os.uname().release
+        if not kernel_version:
             return False, "Failed to get kernel version"
-        kernel_version = result.stdout.strip()
         
         # Install linux-modules-extra
-        steps.append(f"Installing linux-modules-extra-{kernel_version}...")
-        result = run_command(f"apt-get install -y linux-modules-extra-{kernel_version}")
+        steps.step(f"Installing linux-modules-extra-{kernel_version}...")
+        install_modules = ["apt-get", "install", "-y", f"linux-modules-extra-{kernel_version}"]
+        result = run_command(install_modules)
         if not result.success:
-            # Try without specific version as fallback
-            result = run_command("apt-get install -y linux-modules-extra-$(uname -r)")
+            # Retry once before giving up
+            result = run_command(install_modules)
             if not result.success:
-                steps.append(f"Warning: Could not install modules package: {result.stderr}")
+                steps.step(f"Warning: Could not install modules package: {result.stderr}")
         else:
-            steps.append("Package installed successfully")
+            steps.step("Package installed successfully")
         
         # Install iproute2 with l2tp support
-        result = run_command("apt-get install -y iproute2")
+        result = run_command(["apt-get", "install", "-y", "iproute2"])
         if not result.success:
-            steps.append(f"Warning: Could not install iproute2: {result.stderr}")
+            steps.step(f"Warning: Could not install iproute2: {result.stderr}")
         
         # Load kernel modules
-        modules = ["l2tp_core", "l2tp_netlink", "l2tp_eth"]
-        for module in modules:
-            steps.append(f"Loading module {module}...")
-            result = run_command(f"modprobe {module}")
+        for module in L2TP_MODULES:
+            if module in loaded:
+                steps.step(f"Module {module} already loaded")
+                continue
+            steps.step(f"Loading module {module}...")
+            result = run_command(["modprobe", module])
             if not result.success:
                 return False, f"Failed to load module {module}: {result.stderr}"
-            steps.append(f"Module {module} loaded")
+            steps.step(f"Module {module} loaded")
         
         # Verify modules are loaded
-        result = run_command("lsmod | grep l2tp")
-        if "l2tp" not in result.stdout:
-            return False, "L2TP modules not found in lsmod"
+        if not any(name.startswith("l2tp") for name in _loaded_modules()):
+            return False, "L2TP modules not found in /proc/modules"
         
-        steps.append("All prerequisites installed successfully!")
-        return True, "\n".join(steps)
+        steps.step("All prerequisites installed successfully!")
+        return True, steps.getvalue()
     
-    def check_tunnel_exists(self, tunnel_id: int = None) -> bool:
-        """Check if L2TP tunnel exists."""
+    def check_tunnel_exists(self, tunnel_id: int = None,
+                            snap: Optional[L2tpSnapshot] = None) -> bool:
+        """Check if L2TP tunnel exists (in snap, or a listing at most CHECK_CACHE_TTL old)."""
         if tunnel_id is None:
             tunnel_id = self.config.tunnel_id
-        
-        result = run_command("ip l2tp show tunnel")
-        if not result.success:
-            return False
-        
-        # Parse output for tunnel_id
-        pattern = rf"Tunnel\s+{tunnel_id},"
-        return bool(re.search(pattern, result.stdout))
+        if snap is None:
+            snap = self._snapshot(max_age=CHECK_CACHE_TTL)
+        return snap.has_tunnel(tunnel_id)
     
-    def check_session_exists(self, tunnel_id: int = None, session_id: int = None) -> bool:
-        """Check if L2TP session exists."""
+    def check_session_exists(self, tunnel_id: int = None, session_id: int = None,
+                             snap: Optional[L2tpSnapshot] = None) -> bool:
+        """Check if L2TP session exists (in snap, or a listing at most CHECK_CACHE_TTL old)."""
         if tunnel_id is None:
             tunnel_id = self.config.tunnel_id
         if session_id is None:
             session_id = self.config.session_id
-        
-        result = run_command("ip l2tp show session")
-        if not result.success:
-            return False
-        
-        # Parse output for session_id in tunnel
-        pattern = rf"Session\s+{session_id}\s+in\s+tunnel\s+{tunnel_id}"
-        return bool(re.search(pattern, result.stdout))
+        if snap is None:
+            snap = self._snapshot(max_age=CHECK_CACHE_TTL)
+        return snap.has_session(tunnel_id, session_id)
     
     def create_tunnel(self) -> Tuple[bool, str]:
         """Create L2TP tunnel based on configuration."""
@@ -145,20 +432,22 @@ class TunnelManager:
             return False, "IPs not configured. Please configure tunnel first."
         
         ids = self.config.get_tunnel_ids()
+        snap = self._snapshot()
         
-        if self.check_tunnel_exists():
+        if self.check_tunnel_exists(snap=snap):
             return False, f"Tunnel {ids['tunnel_id']} already exists. Delete it first or use recreate."
         
-        cmd = (
-            f"ip l2tp add tunnel "
-            f"tunnel_id {ids['tunnel_id']} "
-            f"peer_tunnel_id {ids['peer_tunnel_id']} "
-            f"encap ip "
-            f"local {self.config.local_ip} "
-            f"remote {self.config.remote_ip}"
-        )
+        cmd = [
+            "ip", "l2tp", "add", "tunnel",
+            "tunnel_id", str(ids['tunnel_id']),
+            "peer_tunnel_id", str(ids['peer_tunnel_id']),
+            "encap", "ip",
+            "local", self.config.local_ip,
+            "remote", self.config.remote_ip,
+        ]
         
         result = run_command(cmd)
+        self._invalidate()
         if not result.success:
             return False, f"Failed to create tunnel: {result.stderr}"
         
@@ -167,21 +456,23 @@ class TunnelManager:
     def create_session(self) -> Tuple[bool, str]:
         """Create L2TP session in existing tunnel."""
         ids = self.config.get_tunnel_ids()
+        snap = self._snapshot()
         
-        if not self.check_tunnel_exists():
+        if not self.check_tunnel_exists(snap=snap):
             return False, "Tunnel does not exist. Create tunnel first."
         
-        if self.check_session_exists():
+        if self.check_session_exists(snap=snap):
             return False, f"Session {ids['session_id']} already exists"
         
-        cmd = (
-            f"ip l2tp add session "
-            f"tunnel_id {ids['tunnel_id']} "
-            f"session_id {ids['session_id']} "
-            f"peer_session_id {ids['peer_session_id']}"
-        )
+        cmd = [
+            "ip", "l2tp", "add", "session",
+            "tunnel_id", str(ids['tunnel_id']),
+            "session_id", str(ids['session_id']),
+            "peer_session_id", str(ids['peer_session_id']),
+        ]
         
         result = run_command(cmd)
+        self._invalidate()
         if not result.success:
             return False, f"Failed to create session: {result.stderr}"
         
@@ -189,11 +480,13 @@ class TunnelManager:
     
     def bring_up_interface(self) -> Tuple[bool, str]:
         """Bring up the tunnel interface."""
-        # Wait a moment for interface to appear
-        import time
-        time.sleep(0.5)
+        # Wait for the interface to appear, but no longer than it takes
+        iface_path = os.path.join(SYS_CLASS_NET, self.interface_name)
+        deadline = time.monotonic() + INTERFACE_WAIT
+        while not os.path.exists(iface_path) and time.monotonic() < deadline:
+            time.sleep(INTERFACE_POLL)
         
-        result = run_command(f"ip link set {self.interface_name} up")
+        result = run_command(["ip", "link", "set", self.interface_name, "up"])
         if not result.success:
             return False, f"Failed to bring up interface: {result.stderr}"
         
@@ -204,11 +497,11 @@ class TunnelManager:
         ip_cidr = self.config.interface_ip
         
         # Check if IP already assigned
-        result = run_command(f"ip addr show {self.interface_name}")
-        if ip_cidr.split('/')[0] in result.stdout:
+        result = run_command(["ip", "addr", "show", self.interface_name])
+        if ip_cidr.split('/')[0].encode() in result.stdout:
             return True, f"IP {ip_cidr} already assigned"
         
-        result = run_command(f"ip addr add {ip_cidr} dev {self.interface_name}")
+        result = run_command(["ip", "addr", "add", ip_cidr, "dev", self.interface_name])
         if not result.success:
             # Check if it's because address exists
             if "RTNETLINK answers: File exists" in result.stderr:
@@ -217,15 +510,20 @@ class TunnelManager:
         
         return True, f"IP {ip_cidr} assigned to {self.interface_name}"
     
-    def delete_session(self) -> Tuple[bool, str]:
-        """Delete L2TP session."""
+    def delete_session(self, snap: Optional[L2tpSnapshot] = None) -> Tuple[bool, str]:
+        """Delete L2TP session (checking existence against snap, if given)."""
         ids = self.config.get_tunnel_ids()
         
-        if not self.check_session_exists():
+        if not self.check_session_exists(snap=snap or self._snapshot()):
             return True, "Session does not exist (already deleted)"
         
-        cmd = f"ip l2tp del session tunnel_id {ids['tunnel_id']} session_id {ids['session_id']}"
+        cmd = [
+            "ip", "l2tp", "del", "session",
+            "tunnel_id", str(ids['tunnel_id']),
+            "session_id", str(ids['session_id']),
+        ]
         result = run_command(cmd)
+        self._invalidate()
         if not result.success:
             return False, f"Failed to delete session: {result.stderr}"
         
@@ -234,74 +532,159 @@ class TunnelManager:
     def delete_tunnel(self) -> Tuple[bool, str]:
         """Delete L2TP tunnel (must delete session first)."""
         ids = self.config.get_tunnel_ids()
+        snap = self._snapshot()
         
-        # First delete session if exists
-        if self.check_session_exists():
-            success, msg = self.delete_session()
-            if not success:
+        # First delete session if exists; a successful delete means it's gone,
+        # only a failure is worth re-checking (it may have vanished meanwhile)
+        if self.check_session_exists(snap=snap):
+            success, msg = self.delete_session(snap=snap)
+            if not success and self.check_session_exists(snap=self._snapshot()):
                 return False, f"Failed to delete session first: {msg}"
         
-        if not self.check_tunnel_exists():
+        # Deleting the session leaves the tunnel listing unchanged
+        if not self.check_tunnel_exists(snap=snap):
             return True, "Tunnel does not exist (already deleted)"
         
-        cmd = f"ip l2tp del tunnel tunnel_id {ids['tunnel_id']}"
+        cmd = ["ip", "l2tp", "del", "tunnel", "tunnel_id", str(ids['tunnel_id'])]
         result = run_command(cmd)
+        self._invalidate()
         if not result.success:
             return False, f"Failed to delete tunnel: {result.stderr}"
         
         return True, f"Tunnel {ids['tunnel_id']} deleted"
     
+    def _apply_steps(self, plan: List[Tuple[str, Optional[str], str, str]], steps: StepLog) -> bool:
+        """
+        Run the pending lines of a step plan as one `ip -batch` and log each step.
+        
+        Each plan entry is (step, ip batch line or None if already done,
+        success message, failure prefix). Returns False if a line failed.
+        """
+        lines = [line for _, line, _, _ in plan if line]
+        result = None
+        if lines:
+            result = run_ip_batch(lines)
+            self._invalidate()
+        if result is None or result.success:
+            failed, error = len(lines), ""
+        else:
+            failed, error = _batch_failure(result)
+        
+        index = 0
+        for step, line, ok_msg, fail_prefix in plan:
+            if line is None or index < failed:
+                steps.step(f"{step}: {ok_msg}")
+            elif index == failed:
+                steps.step(f"{step}: {fail_prefix}: {error}")
+            else:
+                steps.step(f"{step}: Skipped after earlier failure")
+            if line:
+                index += 1
+        
+        return failed >= len(lines)
+    
     def full_setup(self) -> Tuple[bool, str]:
         """Perform full tunnel setup: create tunnel, session, bring up interface, assign IP."""
-        steps = []
+        steps = StepLog()
         tunnel_name = self.config.name
         
-        steps.append(f"=== Setting up tunnel: {tunnel_name} ===")
-        
-        # Create tunnel
-        success, msg = self.create_tunnel()
-        steps.append(f"Create tunnel: {msg}")
-        if not success and "already exists" not in msg:
-            return False, "\n".join(steps)
-        
-        # Create session
-        success, msg = self.create_session()
-        steps.append(f"Create session: {msg}")
-        if not success and "already exists" not in msg:
-            return False, "\n".join(steps)
-        
-        # Bring up interface
-        success, msg = self.bring_up_interface()
-        steps.append(f"Bring up interface: {msg}")
-        if not success:
-            return False, "\n".join(steps)
+        steps.step(f"=== Setting up tunnel: {tunnel_name} ===")
         
-        # Assign IP
-        success, msg = self.assign_ip()
-        steps.append(f"Assign IP: {msg}")
-        if not success:
-            return False, "\n".join(steps)
+        if not self.config.local_ip or not self.config.remote_ip:
+            steps.step("Create tunnel: IPs not configured. Please configure tunnel first.")
+            return False, steps.getvalue()
         
-        steps.append(f"\n✓ Tunnel '{tunnel_name}' setup complete!")
-        return True, "\n".join(steps)
+        ids = self.config.get_tunnel_ids()
+        ip_cidr = self.config.interface_ip
+        addrs = _EXECUTOR.submit(run_command, ["ip", "addr", "show", self.interface_name])
+        snap = self._snapshot()
+        
+        # Only what is missing goes into the batch, so re-running setup is idempotent
+        tunnel_exists = self.check_tunnel_exists(snap=snap)
+        session_exists = self.check_session_exists(snap=snap)
+        ip_assigned = ip_cidr.split('/')[0].encode() in addrs.result().stdout
+        
+        plan = [
+            (
+                "Create tunnel",
+                None if tunnel_exists else (
+                    f"l2tp add tunnel "
+                    f"tunnel_id {ids['tunnel_id']} "
+                    f"peer_tunnel_id {ids['peer_tunnel_id']} "
+                    f"encap ip "
+                    f"local {self.config.local_ip} "
+                    f"remote {self.config.remote_ip}"
+                ),
+                f"Tunnel {ids['tunnel_id']} already exists" if tunnel_exists
+                else f"Tunnel {ids['tunnel_id']} created successfully",
+                "Failed to create tunnel",
+            ),
+            (
+                "Create session",
+                None if session_exists else (
+                    f"l2tp add session "
+                    f"tunnel_id {ids['tunnel_id']} "
+                    f"session_id {ids['session_id']} "
+                    f"peer_session_id {ids['peer_session_id']}"
+                ),
+                f"Session {ids['session_id']} already exists" if session_exists
+                else f"Session {ids['session_id']} created successfully",
+                "Failed to create session",
+            ),
+            (
+                "Bring up interface",
+                f"link set {self.interface_name} up",
+                f"Interface {self.interface_name} is up",
+                "Failed to bring up interface",
+            ),
+            (
+                "Assign IP",
+                None if ip_assigned else f"addr add {ip_cidr} dev {self.interface_name}",
+                f"IP {ip_cidr} already assigned" if ip_assigned
+                else f"IP {ip_cidr} assigned to {self.interface_name}",
+                "Failed to assign IP",
+            ),
+        ]
+        
+        if not self._apply_steps(plan, steps):
+            return False, steps.getvalue()
+        
+        steps.step(f"\n✓ Tunnel '{tunnel_name}' setup complete!")
+        return True, steps.getvalue()
     
     def full_teardown(self) -> Tuple[bool, str]:
         """Perform full tunnel teardown: delete session and tunnel."""
-        steps = []
+        steps = StepLog()
         tunnel_name = self.config.name
         
-        steps.append(f"=== Tearing down tunnel: {tunnel_name} ===")
-        
-        # Delete session
-        success, msg = self.delete_session()
-        steps.append(f"Delete session: {msg}")
+        steps.step(f"=== Tearing down tunnel: {tunnel_name} ===")
         
-        # Delete tunnel
-        success, msg = self.delete_tunnel()
-        steps.append(f"Delete tunnel: {msg}")
-        
-        steps.append(f"\n✓ Tunnel '{tunnel_name}' teardown complete!")
-        return True, "\n".join(steps)
+        ids = self.config.get_tunnel_ids()
+        snap = self._snapshot()
+        tunnel_exists = self.check_tunnel_exists(snap=snap)
+        session_exists = self.check_session_exists(snap=snap)
+        
+        plan = [
+            (
+                "Delete session",
+                f"l2tp del session tunnel_id {ids['tunnel_id']} session_id {ids['session_id']}"
+                if session_exists else None,
+                f"Session {ids['session_id']} deleted" if session_exists
+                else "Session does not exist (already deleted)",
+                "Failed to delete session",
+            ),
+            (
+                "Delete tunnel",
+                f"l2tp del tunnel tunnel_id {ids['tunnel_id']}" if tunnel_exists else None,
+                f"Tunnel {ids['tunnel_id']} deleted" if tunnel_exists
+                else "Tunnel does not exist (already deleted)",
+                "Failed to delete tunnel",
+            ),
+        ]
+        self._apply_steps(plan, steps)
+        
+        steps.step(f"\n✓ Tunnel '{tunnel_name}' teardown complete!")
+        return True, steps.getvalue()
     
     def get_status(self) -> Dict[str, any]:
         """Get comprehensive tunnel status."""
@@ -320,24 +703,26 @@ class TunnelManager:
             "interface_info": "",
         }
         
+        # The interface query runs alongside the snapshot's two l2tp queries;
+        # the report includes the `ip l2tp show` text, so skip the netlink path here
+        iface = _EXECUTOR.submit(run_command, ["ip", "addr", "show", self.interface_name])
+        snap = self._snapshot(text=True)
+        
         # Check tunnel
-        result = run_command("ip l2tp show tunnel")
-        status["tunnel_info"] = result.stdout if result.success else result.stderr
-        status["tunnel_exists"] = self.check_tunnel_exists()
+        status["tunnel_info"] = snap.tunnels_error or _decode(snap.tunnels)
+        status["tunnel_exists"] = self.check_tunnel_exists(snap=snap)
         
         # Check session
-        result = run_command("ip l2tp show session")
-        status["session_info"] = result.stdout if result.success else result.stderr
-        status["session_exists"] = self.check_session_exists()
+        status["session_info"] = snap.sessions_error or _decode(snap.sessions)
+        status["session_exists"] = self.check_session_exists(snap=snap)
         
         # Check interface
-        result = run_command(f"ip addr show {self.interface_name} 2>/dev/null")
+        result = iface.result()
         if result.success and result.stdout:
-            status["interface_info"] = result.stdout
-            status["interface_up"] = "UP" in result.stdout
+            output = result.output
+            status["interface_info"] = output
+            status["interface_up"] = "UP" in output
             # Extract IP
-            ip_match = re.search(r'inet\s+(\d+\.\d+\.\d+\.\d+/\d+)', result.stdout)
-            if ip_match:
-                status["interface_ip"] = ip_match.group(1)
+            status["interface_ip"] = _interface_ip(output)
         
         return status
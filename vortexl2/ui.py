@@ -8,7 +8,10 @@ import os
 import sys
 import re
 import subprocess
-from typing import Optional, List
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Optional, Iterable, List, Tuple
 
 try:
     from rich.console import Console
@@ -16,6 +19,7 @@ try:
     from rich.table import Table
     from rich.text import Text
     from rich.prompt import Prompt, Confirm
+    from rich.live import Live
     from rich import box
 except ImportError:
     print("Error: 'rich' library is required. Install with: pip install rich")
@@ -26,8 +30,21 @@ from .config import TunnelConfig, ConfigManager
 
 console = Console()
 
+LOCAL_IP_TTL = 5  # seconds
+
 
 def get_local_ip() -> Optional[str]:
+    """Auto-detect the server's primary IP address (cached for LOCAL_IP_TTL seconds)."""
+    return _cached_local_ip(int(time.monotonic() // LOCAL_IP_TTL))
+
+
+@lru_cache(maxsize=1)
+def _cached_local_ip(epoch: int) -> Optional[str]:
+    """Detected IP for one TTL window; a new epoch evicts the previous entry."""
+    return _detect_local_ip()
+
+
+def _detect_local_ip() -> Optional[str]:
     """Auto-detect the server's primary IP address."""
     try:
         # Method 1: Get IP from default route interface
@@ -107,42 +124,58 @@ ASCII_BANNER = r"""
      \/ \___/|_|   \__\___/_/\_\______|____|
 """
 
+# The banner and info panel never change at runtime, so build them once
+_BANNER_TEXT = Text(ASCII_BANNER, style="bold cyan")
+_BANNER_PANEL = Panel(
+    f"[bold white]Telegram:[/] [cyan]@iliyadevsh[/] | [bold white]Version:[/] [red]{__version__}[/] | "
+    f"[bold white]GitHub:[/] [cyan]github.com/iliya-Developer[/]",
+    title="[bold white]VortexL2 - L2TPv3 Tunnel Manager[/]",
+    border_style="cyan",
+    box=box.ROUNDED,
+)
+
 
 def clear_screen():
     """Clear terminal screen."""
-    os.system("clear" if os.name != "nt" else "cls")
+    if os.name == "nt" and console.legacy_windows:
+        # Old Windows consoles without VT sequence support
+        os.system("cls")
+    else:
+        # Emits the ANSI clear/home sequences directly instead of spawning `clear`
+        console.clear()
 
 
 def show_banner():
     """Display the ASCII banner with developer info."""
     clear_screen()
-    banner_text = Text(ASCII_BANNER, style="bold cyan")
-
-    console.print(banner_text)
-    console.print(
-        Panel(
-            f"[bold white]Telegram:[/] [cyan]@iliyadevsh[/] | [bold white]Version:[/] [red]{__version__}[/] | "
-            f"[bold white]GitHub:[/] [cyan]github.com/iliya-Developer[/]",
-            title="[bold white]VortexL2 - L2TPv3 Tunnel Manager[/]",
-            border_style="cyan",
-            box=box.ROUNDED,
-        )
-    )
+    console.print(_BANNER_TEXT)
+    console.print(_BANNER_PANEL)
     console.print()
 
 
-def show_main_menu() -> str:
-    """Display main menu and get user choice."""
-    menu_items = [
-        ("1", "Install/Verify Prerequisites"),
-        ("2", "Create Tunnel"),
-        ("3", "Delete Tunnel"),
-        ("4", "List Tunnels"),
-        ("5", "Port Forwards"),
-        ("6", "View Logs"),
-        ("0", "Exit"),
-    ]
-
+_MAIN_ITEMS = [
+    ("1", "Install/Verify Prerequisites"),
+    ("2", "Create Tunnel"),
+    ("3", "Delete Tunnel"),
+    ("4", "List Tunnels"),
+    ("5", "Port Forwards"),
+    ("6", "View Logs"),
+    ("0", "Exit"),
+]
+
+_FORWARDS_ITEMS = [
+    ("1", "Add Port Forwards"),
+    ("2", "Remove Port Forwards"),
+    ("3", "List Port Forwards"),
+    ("4", "Restart All Forwards"),
+    ("5", "Stop All Forwards"),
+    ("6", "Start All Forwards"),
+    ("0", "Back to Main Menu"),
+]
+
+
+def _build_table(menu_items: List[Tuple[str, str]]) -> Table:
+    """Build the option/description table for a menu."""
     table = Table(show_header=False, box=box.SIMPLE, padding=(0, 2))
     table.add_column("Option", style="bold cyan", width=4)
     table.add_column("Description", style="white")
@@ -150,30 +183,25 @@ def show_main_menu() -> str:
     for opt, desc in menu_items:
         table.add_row(f"[{opt}]", desc)
 
-    console.print(Panel(table, title="[bold white]Main Menu[/]", border_style="blue"))
-    return Prompt.ask("\n[bold cyan]Select option[/]", default="0")
+    return table
 
 
-def show_forwards_menu() -> str:
-    """Display forwards submenu."""
-    menu_items = [
-        ("1", "Add Port Forwards"),
-        ("2", "Remove Port Forwards"),
-        ("3", "List Port Forwards"),
-        ("4", "Restart All Forwards"),
-        ("5", "Stop All Forwards"),
-        ("6", "Start All Forwards"),
-        ("0", "Back to Main Menu"),
-    ]
+# Menus are static, so build their panels once rather than on every redraw
+_MAIN_MENU_PANEL = Panel(_build_table(_MAIN_ITEMS), title="[bold white]Main Menu[/]", border_style="blue")
+_FORWARDS_MENU_PANEL = Panel(
+    _build_table(_FORWARDS_ITEMS), title="[bold white]Port Forwards[/]", border_style="green"
+)
 
-    table = Table(show_header=False, box=box.SIMPLE, padding=(0, 2))
-    table.add_column("Option", style="bold cyan", width=4)
-    table.add_column("Description", style="white")
 
-    for opt, desc in menu_items:
-        table.add_row(f"[{opt}]", desc)
+def show_main_menu() -> str:
+    """Display main menu and get user choice."""
+    console.print(_MAIN_MENU_PANEL)
+    return Prompt.ask("\n[bold cyan]Select option[/]", default="0")
 
-    console.print(Panel(table, title="[bold white]Port Forwards[/]", border_style="green"))
+
+def show_forwards_menu() -> str:
+    """Display forwards submenu."""
+    console.print(_FORWARDS_MENU_PANEL)
     return Prompt.ask("\n[bold cyan]Select option[/]", default="0")
 
 
@@ -440,7 +468,7 @@ def prompt_tunnel_config(config: TunnelConfig, side: str, manager: ConfigManager
 
 def prompt_ports() -> str:
     """Prompt user for ports to forward."""
-    console.print("\n[dim]Enter ports as comma-separated list (e.g., 443,80,2053)[/]")
+    console.print("\n[dim]Enter ports as comma-separated list or ranges (e.g., 443,80,2053,8000-8010)[/]")
     return Prompt.ask("[bold cyan]Ports[/]")
 
 
@@ -531,6 +559,17 @@ def show_output(output: str, title: str = "Output"):
     console.print(Panel(output, title=title, border_style="dim"))
 
 
+def show_output_stream(lines: Iterable[str], title: str = "Output", max_lines: int = 200,
+                       empty: str = "No output"):
+    """Display command output in a panel that fills in as lines arrive (keeps the last max_lines)."""
+    shown = deque(maxlen=max_lines)
+    with Live(Panel(empty, title=title, border_style="dim"), console=console,
+              refresh_per_second=10) as live:
+        for line in lines:
+            shown.append(line)
+            live.update(Panel("\n".join(shown), title=title, border_style="dim"))
+
+
 def wait_for_enter():
     """Wait for user to press Enter."""
     console.print()